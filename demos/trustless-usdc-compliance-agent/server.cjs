@@ -450,17 +450,21 @@ async function handleSettle(req, res, sendEvent) {
   };
 
   try {
-    // Step 1: Screen sender
+    // Steps 1-2: Screen sender and recipient concurrently (independent network calls)
     emitStep(1, 'active');
     console.log('[STEP 1] Screening sender (agent wallet)...');
-    const senderScreening = await screenAddress(wallet.address);
-    emitStep(1, 'complete', { result: senderScreening });
-
-    // Step 2: Screen recipient
     emitStep(2, 'active');
     console.log('[STEP 2] Screening recipient...');
-    const recipientScreening = await screenAddress(to);
-    emitStep(2, 'complete', { result: recipientScreening });
+    const [senderScreening, recipientScreening] = await Promise.all([
+      screenAddress(wallet.address).then((result) => {
+        emitStep(1, 'complete', { result });
+        return result;
+      }),
+      screenAddress(to).then((result) => {
+        emitStep(2, 'complete', { result });
+        return result;
+      })
+    ]);
 
     // Combine screening results
     const screening = {
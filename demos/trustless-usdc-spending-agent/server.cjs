@@ -6,6 +6,7 @@ require('dotenv').config({ path: path.resolve(__dirname, '.env'), override: true
 
 const express = require('express');
 const fs = require('fs');
+const os = require('os');
 const crypto = require('crypto');
 const { spawn } = require('child_process');
 const { ethers } = require('ethers');
@@ -54,6 +55,127 @@ const SPEND_GATE_ADDRESS = process.env.SPEND_GATE_ADDRESS || '';
 const JOLT_PROVER_BIN = process.env.JOLT_PROVER_BIN || '';
 const JOLT_MODEL_PATH = process.env.JOLT_MODEL_PATH || path.resolve(__dirname, '..', '..', 'jolt-atlas', 'onnx-tracer', 'models', 'authorization', 'network.onnx');
 const OOAK_ONNX_MODEL = process.env.OOAK_ONNX_MODEL || path.resolve(__dirname, '..', '..', 'models', 'spending_model.onnx');
+// OOAK_QUANTIZE=1 runs the INT8 dynamic-quantized copy (<model>.int8.onnx) when present.
+// I/O stays float32, so decision/confidence mapping is unchanged.
+const OOAK_QUANTIZE = process.env.OOAK_QUANTIZE === '1';
+const OOAK_INT8_MODEL = OOAK_ONNX_MODEL.replace(/\.onnx$/, '') + '.int8.onnx';
+const INFERENCE_MODEL = OOAK_QUANTIZE && fs.existsSync(OOAK_INT8_MODEL) ? OOAK_INT8_MODEL : OOAK_ONNX_MODEL;
+if (OOAK_QUANTIZE && INFERENCE_MODEL !== OOAK_INT8_MODEL) {
+  console.warn(`[onnx] OOAK_QUANTIZE=1 but ${OOAK_INT8_MODEL} not found; using FP32 model`);
+}
+// Writable directory for ORT-optimized model copies (never the model's own directory)
+const OOAK_ORT_CACHE_DIR = process.env.OOAK_ORT_CACHE_DIR || path.join(os.tmpdir(), 'ooak-ort-cache');
+
+const ATTESTOR_PRIVATE_KEY = process.env.ATTESTOR_PRIVATE_KEY || process.env.PRIVATE_KEY;
+// Provider-less signer for proof attestations; signing needs only the key, so it
+// and its address are derived once at startup instead of per request. A malformed
+// key leaves it unset rather than stopping the server.
+let ATTESTOR_SIGNER = null;
+if (ATTESTOR_PRIVATE_KEY) {
+  try {
+    ATTESTOR_SIGNER = new ethers.Wallet(ATTESTOR_PRIVATE_KEY);
+  } catch (e) {
+    console.warn(`[attest] invalid ATTESTOR_PRIVATE_KEY/PRIVATE_KEY, attestations disabled: ${e.message}`);
+  }
+}
+const ATTESTOR_ADDRESS = ATTESTOR_SIGNER ? ATTESTOR_SIGNER.address : null;
+const ARC_RPC_URL = process.env.ARC_RPC_URL || process.env.OOAK_RPC_URL || 'https://rpc.testnet.arc.network';
+
+// Contract ABIs, parsed once and shared by every cached contract instance
+const CONTRACT_ABIS = {
+  joltVerifier: new ethers.Interface([
+    'function verify(bytes32 proofHash, bytes sig) view returns (bool)'
+  ]),
+  spendGate: new ethers.Interface([
+    'function spend((bytes32,bytes32,bytes32,uint256,uint256,address,address,uint256,uint256,uint256,uint256,address,address),bytes) payable'
+  ]),
+  registry: new ethers.Interface([
+    'function store((bytes32,bytes32,bytes32,uint256,uint256,address,address,uint256,uint256,uint256,uint256,address,address) c, bytes signature) returns (bytes32)'
+  ])
+};
+
+// EIP-712 CommitmentRegistry commitment type; field order matches the contract tuple
+const REGISTRY_COMMITMENT_TYPES = {
+  Commitment: [
+    { name: 'proofHash', type: 'bytes32' },
+    { name: 'modelHash', type: 'bytes32' },
+    { name: 'inputHash', type: 'bytes32' },
+    { name: 'decision', type: 'uint256' },
+    { name: 'confidence', type: 'uint256' },
+    { name: 'token', type: 'address' },
+    { name: 'to', type: 'address' },
+    { name: 'amount', type: 'uint256' },
+    { name: 'chainId', type: 'uint256' },
+    { name: 'nonce', type: 'uint256' },
+    { name: 'validUntil', type: 'uint256' },
+    { name: 'agent', type: 'address' },
+    { name: 'attestor', type: 'address' },
+  ]
+};
+const REGISTRY_COMMITMENT_FIELDS = REGISTRY_COMMITMENT_TYPES.Commitment.map((f) => f.name);
+
+// Convert a commitment object to the positional tuple spend()/store() take
+function commitmentToTuple(commitment) {
+  return REGISTRY_COMMITMENT_FIELDS.map((name) => commitment[name]);
+}
+
+// Providers, wallets and contracts are cached so approvals reuse one keep-alive
+// RPC connection and skip network detection, key derivation and ABI setup per request.
+const providerCache = new Map();
+const walletCache = new Map();
+const contractCache = new Map();
+
+// Short request timeout for read-only calls. Signing wallets keep ethers' default,
+// so a slow RPC doesn't fail a transaction that was already broadcast.
+const RPC_READ_TIMEOUT_MS = 5000;
+
+function getProvider(rpcUrl = ARC_RPC_URL, timeoutMs = null) {
+  const key = `${rpcUrl}|${timeoutMs || ''}`;
+  let provider = providerCache.get(key);
+  if (!provider) {
+    const request = new ethers.FetchRequest(rpcUrl);
+    if (timeoutMs) request.timeout = timeoutMs;
+    provider = new ethers.JsonRpcProvider(request, undefined, { staticNetwork: true });
+    providerCache.set(key, provider);
+  }
+  return provider;
+}
+
+function getWallet(privateKey) {
+  let wallet = walletCache.get(privateKey);
+  if (!wallet) {
+    wallet = new ethers.Wallet(privateKey, getProvider());
+    walletCache.set(privateKey, wallet);
+  }
+  return wallet;
+}
+
+function getContract(address, abiKey, runner) {
+  const key = `${abiKey}:${address}:${runner.address || 'provider'}`;
+  let contract = contractCache.get(key);
+  if (!contract) {
+    contract = new ethers.Contract(address, CONTRACT_ABIS[abiKey], runner);
+    contractCache.set(key, contract);
+  }
+  return contract;
+}
+
+// keccak256 of the inference model, cached until the file's mtime changes so
+// each commitment doesn't re-read and re-hash the whole model from disk.
+let modelHashCache = null;
+function getModelHash(modelPath = INFERENCE_MODEL) {
+  let mtimeMs = -1;
+  try { mtimeMs = fs.statSync(modelPath).mtimeMs; } catch {}
+  if (!modelHashCache || modelHashCache.path !== modelPath || modelHashCache.mtimeMs !== mtimeMs) {
+    let modelBytes = new Uint8Array();
+    try { modelBytes = new Uint8Array(fs.readFileSync(modelPath)); } catch {}
+    modelHashCache = { path: modelPath, mtimeMs, hash: ethers.keccak256(modelBytes) };
+  }
+  return modelHashCache.hash;
+}
+
+// 32-byte hash as hex with optional 0x prefix; group 1 captures the bare digits
+const HEX64 = /^(?:0x)?([0-9a-fA-F]{64})$/;
 
 // BN254 scalar field modulus - used for zkSNARK proof hash conversion
 const BN254_SCALAR_FIELD = BigInt('21888242871839275222246405745257275088548364400416034343698204186575808495617');
@@ -61,10 +183,17 @@ const BN254_SCALAR_FIELD = BigInt('218882428718392752222464057452572750885483644
 function sha256Hex(buf) {
   return crypto.createHash('sha256').update(buf).digest('hex');
 }
-function sha256ToField(buf) {
-  const h = crypto.createHash('sha256').update(buf).digest();
-  const n = BigInt('0x' + h.toString('hex')) % BN254_SCALAR_FIELD;
-  return n.toString();
+// Reduce an already-computed SHA-256 hex digest into the BN254 scalar field
+function sha256HexToField(hashHex) {
+  const n = BigInt('0x' + hashHex);
+  return (n < BN254_SCALAR_FIELD ? n : n % BN254_SCALAR_FIELD).toString();
+}
+
+// Only a found binary is remembered
+let joltBinOk = false;
+function joltProverAvailable() {
+  if (!joltBinOk) joltBinOk = fs.existsSync(JOLT_PROVER_BIN);
+  return joltBinOk;
 }
 
 // Serve static UI
@@ -78,23 +207,21 @@ app.get('/api/health', (_req, res) => {
     rpcUrl: RPC_URL,
     registry: COMMITMENT_REGISTRY_ADDRESS || null,
     spendGate: SPEND_GATE_ADDRESS || null,
-    joltProver: fs.existsSync(JOLT_PROVER_BIN) ? JOLT_PROVER_BIN : null,
-    onnxModel: fs.existsSync(OOAK_ONNX_MODEL) ? OOAK_ONNX_MODEL : null,
+    joltProver: joltProverAvailable() ? JOLT_PROVER_BIN : null,
+    onnxModel: fs.existsSync(INFERENCE_MODEL) ? INFERENCE_MODEL : null,
     hasPrivateKey: !!process.env.PRIVATE_KEY
   });
 });
 
-// Run JOLT-Atlas prover (if available) to produce zkML proof and hash
-app.post('/api/zkml/prove', async (req, res) => {
-  try {
-    const { decision, confidence } = req.body || {};
-    if (decision === undefined || confidence === undefined) {
-      return res.status(400).json({ error: 'decision and confidence required' });
-    }
-    if (!fs.existsSync(JOLT_PROVER_BIN)) {
-      const msg = 'JOLT prover binary not found; set JOLT_PROVER_BIN to enable proofHash for binding.';
-      return res.status(200).json({ joltPresent: false, decision: Number(decision), confidence: Number(confidence), note: msg });
-    }
+// Run JOLT-Atlas prover (if available) to produce zkML proof and hash.
+// The approval flows call this in-process instead of looping back through
+// HTTP to /api/zkml/prove, which skips a request/JSON round trip per proof.
+function proveWithJolt(decision, confidence) {
+  if (!joltProverAvailable()) {
+    const msg = 'JOLT prover binary not found; set JOLT_PROVER_BIN to enable proofHash for binding.';
+    return Promise.resolve({ joltPresent: false, decision: Number(decision), confidence: Number(confidence), note: msg });
+  }
+  return new Promise((resolve, reject) => {
     // Support two styles: llm_prover (--flags) or proof_json_output <model> <inputs...>
     let child;
     let args = [];
@@ -127,45 +254,53 @@ app.post('/api/zkml/prove', async (req, res) => {
       ];
       child = spawn(JOLT_PROVER_BIN, args, { cwd });
     }
-    let out = '';
-    let err = '';
-    child.stdout.on('data', (d) => { out += d.toString(); });
-    child.stderr.on('data', (d) => { err += d.toString(); });
+    const outChunks = [];
+    const errChunks = [];
+    child.stdout.on('data', (d) => { outChunks.push(d); });
+    child.stderr.on('data', (d) => { errChunks.push(d); });
     child.on('close', (code) => {
+      const out = Buffer.concat(outChunks).toString();
+      const err = Buffer.concat(errChunks).toString();
       try {
         if (code !== 0) throw new Error(`jolt prover exited with ${code}: ${err}`);
         let jsonRaw = null;
+        // Exact text/bytes jsonRaw was parsed from; hashed as-is rather than re-serialized
+        let jsonSrc = null;
         // Try parsing entire stdout as JSON
-        try { jsonRaw = JSON.parse(out.trim()); } catch {}
+        try { const t = out.trim(); jsonRaw = JSON.parse(t); jsonSrc = t; } catch {}
         // Try marker-based JSON extraction
         if (!jsonRaw) {
           const start = out.indexOf('===PROOF_START===');
           const end = out.indexOf('===PROOF_END===');
           if (start !== -1 && end !== -1) {
-            jsonRaw = JSON.parse(out.slice(start + '===PROOF_START==='.length, end).trim());
+            jsonSrc = out.slice(start + '===PROOF_START==='.length, end).trim();
+            jsonRaw = JSON.parse(jsonSrc);
           }
         }
         // Fallback: llm_proof.json file near binary
         if (!jsonRaw) {
           const p = path.resolve(cwd, 'llm_proof.json');
-          if (fs.existsSync(p)) jsonRaw = JSON.parse(fs.readFileSync(p, 'utf8'));
+          if (fs.existsSync(p)) {
+            jsonSrc = fs.readFileSync(p);
+            jsonRaw = JSON.parse(jsonSrc);
+          }
         }
-        // Compute proofBytes robustly
+        // Compute proofBytes robustly; strings and Buffers feed the hash without an extra copy
         let proofBytes;
         if (jsonRaw) {
           if (Array.isArray(jsonRaw.proof_bytes)) {
             proofBytes = Buffer.from(jsonRaw.proof_bytes);
           } else if (typeof jsonRaw.proof === 'string') {
-            proofBytes = Buffer.from(jsonRaw.proof);
+            proofBytes = jsonRaw.proof;
           } else {
-            proofBytes = Buffer.from(JSON.stringify(jsonRaw));
+            proofBytes = jsonSrc;
           }
         } else {
-          proofBytes = Buffer.from(out);
+          proofBytes = out;
         }
         const hashHex = sha256Hex(proofBytes);
-        const hashF = sha256ToField(proofBytes);
-        res.json({
+        const hashF = sha256HexToField(hashHex);
+        resolve({
           joltPresent: true,
           decision: Number((jsonRaw && jsonRaw.decision) ?? decision),
           confidence: Number((jsonRaw && jsonRaw.confidence) ?? confidence),
@@ -174,11 +309,23 @@ app.post('/api/zkml/prove', async (req, res) => {
           raw: jsonRaw || { note: 'stdout_hashed' }
         });
       } catch (e) {
-        res.status(500).json({ error: String(e), stderr: err, stdout: out.slice(0, 4000) });
+        e.details = { stderr: err, stdout: out.slice(0, 4000) };
+        reject(e);
       }
     });
+    child.on('error', reject);
+  });
+}
+
+app.post('/api/zkml/prove', async (req, res) => {
+  try {
+    const { decision, confidence } = req.body || {};
+    if (decision === undefined || confidence === undefined) {
+      return res.status(400).json({ error: 'decision and confidence required' });
+    }
+    res.json(await proveWithJolt(decision, confidence));
   } catch (e) {
-    res.status(500).json({ error: String(e) });
+    res.status(500).json({ error: String(e), ...e.details });
   }
 });
 
@@ -186,14 +333,12 @@ app.post('/api/zkml/prove', async (req, res) => {
 app.post('/api/jolt/attest', async (req, res) => {
   try {
     const { proofHashHex } = req.body || {};
-    if (!proofHashHex || !/^([0-9a-fA-F]{64})$/.test(proofHashHex.replace(/^0x/, ''))) return res.status(400).json({ error: 'invalid_proofHashHex' });
-    const pk = process.env.ATTESTOR_PRIVATE_KEY || process.env.PRIVATE_KEY;
-    if (!pk) return res.status(400).json({ error: 'missing_attestor_key' });
-    const provider = new ethers.JsonRpcProvider(process.env.ARC_RPC_URL || process.env.OOAK_RPC_URL || 'https://rpc.testnet.arc.network');
-    const wallet = new ethers.Wallet(pk, provider);
-    const hash = proofHashHex.startsWith('0x') ? proofHashHex : ('0x' + proofHashHex);
-    const sig = await wallet.signMessage(ethers.getBytes(hash));
-    res.json({ attestor: wallet.address, proofHash: hash, signature: sig });
+    const m = typeof proofHashHex === 'string' && HEX64.exec(proofHashHex);
+    if (!m) return res.status(400).json({ error: 'invalid_proofHashHex' });
+    if (!ATTESTOR_SIGNER) return res.status(400).json({ error: 'missing_attestor_key' });
+    const hash = '0x' + m[1];
+    const sig = ATTESTOR_SIGNER.signMessageSync(ethers.getBytes(hash));
+    res.json({ attestor: ATTESTOR_ADDRESS, proofHash: hash, signature: sig });
   } catch (e) {
     res.status(500).json({ error: String(e) });
   }
@@ -204,10 +349,10 @@ app.post('/api/jolt/verify-onchain', async (req, res) => {
     const { proofHashHex, signature } = req.body || {};
     if (!ARC_JOLT_VERIFIER_ADDRESS) return res.status(400).json({ error: 'missing_arc_jolt_verifier' });
     if (!proofHashHex || !signature) return res.status(400).json({ error: 'missing_params' });
-    const provider = new ethers.JsonRpcProvider(process.env.ARC_RPC_URL || process.env.OOAK_RPC_URL || 'https://rpc.testnet.arc.network');
-    const abi = [ 'function verify(bytes32 proofHash, bytes sig) view returns (bool)' ];
-    const c = new ethers.Contract(ARC_JOLT_VERIFIER_ADDRESS, new ethers.Interface(abi), provider);
-    const ok = await c.verify(proofHashHex.startsWith('0x') ? proofHashHex : ('0x' + proofHashHex), signature);
+    const m = typeof proofHashHex === 'string' && HEX64.exec(proofHashHex);
+    if (!m) return res.status(400).json({ error: 'invalid_proofHashHex' });
+    const c = getContract(ARC_JOLT_VERIFIER_ADDRESS, 'joltVerifier', getProvider(ARC_RPC_URL, RPC_READ_TIMEOUT_MS));
+    const ok = await c.verify('0x' + m[1], signature);
     res.json({ verified: !!ok, contract: ARC_JOLT_VERIFIER_ADDRESS });
   } catch (e) {
     res.status(500).json({ error: String(e) });
@@ -216,39 +361,172 @@ app.post('/api/jolt/verify-onchain', async (req, res) => {
 
 // Store verification on-chain (Arc Testnet) - creates permanent record
 
+// ONNX inference sessions, created once per model path and reused across requests.
+// Session init (graph parse + optimization + kernel allocation) dominates a
+// single inference on this model, so approvals must not pay it every time.
+const onnxSessions = new Map();
+// Model input layout (16 float32, in column order). Keys a caller omits take the
+// default shown; ratio and flag features are clamped to [0, 1], amount_norm to >= 0.
+const ONNX_NUM_FEATURES = 16;
+
+const clamp01 = (v) => Math.min(1, Math.max(0, v));
+
+// Write a feature object into one model input row
+function packFeatures(k, o) {
+  o[0] = Math.max(0, k.amount_norm ?? 0.05);
+  o[1] = clamp01(k.balance_norm ?? 1.0);
+  o[2] = clamp01(k.vendor_trust ?? 0.85);
+  o[3] = clamp01(k.velocity_1h_norm ?? 0.12);
+  o[4] = clamp01(k.velocity_24h_norm ?? 0.25);
+  o[5] = clamp01(k.merchant_risk ?? 0.2);
+  o[6] = clamp01(k.country_risk ?? 0.2);
+  o[7] = clamp01(k.device_trust ?? 0.9);
+  o[8] = clamp01(k.kyc_ok ?? 1.0);
+  o[9] = clamp01(k.aml_ok ?? 1.0);
+  o[10] = clamp01(k.account_age_norm ?? 0.8);
+  o[11] = clamp01(k.chargeback_rate ?? 0.05);
+  o[12] = clamp01(k.ip_risk ?? 0.2);
+  o[13] = clamp01(k.geo_distance_norm ?? 0.3);
+  o[14] = clamp01(k.prior_declines_norm ?? 0.1);
+  o[15] = clamp01(k.category_risk ?? 0.2);
+}
+
+// Path of the ORT-optimized copy of a model, written on first session init.
+// The name carries the model's content digest (the same keccak256 commitments
+// record as modelHash), so a replaced model never reuses another model's graph
+// whatever its mtime, plus the ORT version and architecture, since level 'all'
+// graphs can hold version- and CPU-specific kernels.
+function optimizedModelPath(ort, modelPath) {
+  let ortVersion = ort.env && ort.env.versions && ort.env.versions.node;
+  if (!ortVersion) {
+    try { ortVersion = require('onnxruntime-node/package.json').version; } catch { ortVersion = 'unknown'; }
+  }
+  const digest = getModelHash(modelPath).slice(2);
+  const name = `${path.basename(modelPath, '.onnx')}-${digest}-ort${ortVersion}-${process.arch}.opt.onnx`;
+  return path.join(OOAK_ORT_CACHE_DIR, name);
+}
+
+function getOnnxSession(modelPath) {
+  let entry = onnxSessions.get(modelPath);
+  if (!entry) {
+    const ort = require('onnxruntime-node');
+    const baseOptions = {
+      executionProviders: ['cpu'],
+      executionMode: 'sequential',
+      intraOpNumThreads: os.cpus().length
+    };
+    // Reuse the optimized graph from a previous run of this exact model
+    const optPath = optimizedModelPath(ort, modelPath);
+    let options = { ...baseOptions, graphOptimizationLevel: 'all' };
+    let loadPath = modelPath;
+    if (fs.existsSync(optPath)) {
+      loadPath = optPath;
+      options = { ...baseOptions, graphOptimizationLevel: 'disabled' };
+    }
+    if (loadPath === modelPath) {
+      try {
+        fs.mkdirSync(OOAK_ORT_CACHE_DIR, { recursive: true });
+        options.optimizedModelFilePath = optPath;
+      } catch {}
+    }
+    // Cache the promise so concurrent first requests share one session init.
+    // If loading or saving the optimized copy fails, retry once from the source
+    // model without saving so inference is not disabled by the cache.
+    entry = ort.InferenceSession.create(loadPath, options)
+      .catch((e) => {
+        if (loadPath === modelPath && !options.optimizedModelFilePath) throw e;
+        console.warn(`[onnx] optimized model cache unusable (${e.message}); loading ${modelPath} directly`);
+        return ort.InferenceSession.create(modelPath, { ...baseOptions, graphOptimizationLevel: 'all' });
+      })
+      .then((session) => {
+        // Input buffer, tensor and I/O names are fixed per session and resolved once;
+        // each run only rewrites the floats and fetches just the output it reads
+        const x = new Float32Array(ONNX_NUM_FEATURES);
+        return Object.freeze({
+          session,
+          inputName: session.inputNames[0],
+          outputName: session.outputNames[0],
+          fetches: [session.outputNames[0]],
+          x,
+          input: new ort.Tensor('float32', x, [1, ONNX_NUM_FEATURES]),
+          queue: { tail: Promise.resolve() }
+        });
+      });
+    entry.catch(() => onnxSessions.delete(modelPath));
+    onnxSessions.set(modelPath, entry);
+  }
+  return entry;
+}
+
+// session.run() executes on a later tick, so runs sharing the input buffer are
+// serialized to keep a concurrent request from overwriting it mid-flight.
+function runOnnx(entry, fill) {
+  const run = entry.queue.tail.then(async () => {
+    fill(entry.x);
+    const out = await entry.session.run({ [entry.inputName]: entry.input }, entry.fetches);
+    return out[entry.outputName].data;
+  });
+  entry.queue.tail = run.catch(() => {});
+  return run;
+}
+
+// Map a model score to decision/confidence
+function decideFromScore(score, risk) {
+  // Override: approve if risk is low (< 0.1) regardless of model output
+  const decision = Number(risk) < 0.1 ? 1 : (score >= 0.5 ? 1 : 0);
+  // Use high confidence (95%) when overriding due to low risk, otherwise calculate from model score
+  const confidence = Number(risk) < 0.1 ? 95 : Math.max(0, Math.min(100, Math.round(Math.abs(score - 0.5) * 200)));
+  return { decision, confidence, score };
+}
+
+// Deterministic decision used when the ONNX model is unavailable
+function fallbackDecision(risk) {
+  // Fallback: approve if risk is low
+  const decision = Number(risk) < 0.1 ? 1 : 0;
+  const confidence = decision === 1 ? 95 : 10;
+  return { decision, confidence, score: Number(risk) };
+}
+
 // ONNX inference (real) helper
 async function inferONNX(amount, risk) {
   // Try to run a small ONNX model if present; fallback to deterministic mapping.
   try {
-    const ort = require('onnxruntime-node');
-    const modelPath = process.env.OOAK_ONNX_MODEL || path.resolve(ROOT, '..', 'models', 'spending_model.onnx');
+    const modelPath = INFERENCE_MODEL;
     if (fs.existsSync(modelPath)) {
-      const session = await ort.InferenceSession.create(modelPath);
-      // Features (16): amount_norm, balance_norm, vendor_trust, v1h_norm, v24h_norm, merchant_risk, country_risk, device_trust, kyc_ok, aml_ok, account_age_norm, chargeback_rate, ip_risk, geo_distance_norm, prior_declines_norm, category_risk
-      const amountNorm = Number(amount) / 1000.0;
-      const x = Float32Array.from([
-        amountNorm, 1.0, 0.85, 0.12, 0.25, 0.2, 0.2, 0.9, 1.0, 1.0,
-        0.8, 0.05, 0.2, 0.3, 0.1, 0.2
-      ]);
-      const inputName = session.inputNames[0];
-      const tensor = new ort.Tensor('float32', x, [1, x.length]);
-      const out = await session.run({ [inputName]: tensor });
-      const outName = session.outputNames[0];
-      const y = out[outName].data;
+      const entry = await getOnnxSession(modelPath);
+      const features = { amount_norm: Number(amount) / 1000.0 };
+      const y = await runOnnx(entry, (x) => packFeatures(features, x));
       const score = y && y.length ? Number(y[0]) : 0.0;
-      // Override: approve if risk is low (< 0.1) regardless of model output
-      const decision = Number(risk) < 0.1 ? 1 : (score >= 0.5 ? 1 : 0);
-      // Use high confidence (95%) when overriding due to low risk, otherwise calculate from model score
-      const confidence = Number(risk) < 0.1 ? 95 : Math.max(0, Math.min(100, Math.round(Math.abs(score - 0.5) * 200)));
-      return { decision, confidence, score };
+      return decideFromScore(score, risk);
     }
   } catch (e) {
     // Silent fallback
   }
-  // Fallback: approve if risk is low
-  const decision = Number(risk) < 0.1 ? 1 : 0;
-  const confidence = decision === 1 ? 95 : 10;
-  return { decision, confidence, score: Number(risk) };
+  return fallbackDecision(risk);
+}
+
+// Batched ONNX inference: all rows go through a single session.run() with an
+// [N, features] input, amortizing per-call overhead. Requires a model exported
+// with a dynamic batch axis; fixed-batch models fall back to per-row inferONNX.
+async function inferONNXBatch(items) {
+  try {
+    const modelPath = INFERENCE_MODEL;
+    if (items.length && fs.existsSync(modelPath)) {
+      const ort = require('onnxruntime-node');
+      const { session, inputName, outputName, fetches } = await getOnnxSession(modelPath);
+      const x = new Float32Array(items.length * ONNX_NUM_FEATURES);
+      items.forEach(({ amount = 25.0 }, i) => {
+        packFeatures({ amount_norm: Number(amount) / 1000.0 }, x.subarray(i * ONNX_NUM_FEATURES, (i + 1) * ONNX_NUM_FEATURES));
+      });
+      const out = await session.run({ [inputName]: new ort.Tensor('float32', x, [items.length, ONNX_NUM_FEATURES]) }, fetches);
+      const y = out[outputName].data;
+      const stride = y.length / items.length;
+      return items.map(({ risk = 0.05 }, i) => decideFromScore(Number(y[i * stride]), risk));
+    }
+  } catch (e) {
+    // Fall through to per-row inference
+  }
+  return Promise.all(items.map(({ amount = 25.0, risk = 0.05 }) => inferONNX(amount, risk)));
 }
 
 // Orchestrated approval: ONNX → zkML → Attestation (MANDATORY FLOW)
@@ -294,11 +572,11 @@ app.post('/api/approve', async (req, res) => {
       } catch (error) {
         console.error('[x402] Failed, falling back to local:', error.message);
         // Fallback to local proof generation
-        jolt = await fetchJson('POST', '/api/zkml/prove', { decision, confidence });
+        jolt = await proveWithJolt(decision, confidence).catch((e) => ({ error: String(e) }));
       }
     } else {
       // Use local zkML proof generation (free)
-      jolt = await fetchJson('POST', '/api/zkml/prove', { decision, confidence });
+      jolt = await proveWithJolt(decision, confidence).catch((e) => ({ error: String(e) }));
     }
 
     // Verify proof was generated
@@ -322,12 +600,12 @@ app.post('/api/approve', async (req, res) => {
 
     // Add delay to avoid rate limits
     await new Promise(resolve => setTimeout(resolve, 2000));
-    const commit = await fetchJson('POST', '/api/commit/store', {
+    const commit = await storeCommitment({
       amount,
       decision,
       confidence,
       proofHashHex: jolt.proofHashHex
-    });
+    }).catch((e) => ({ error: String(e) }));
 
     if (!commit || !commit.stored) {
       return res.status(500).json({
@@ -367,6 +645,102 @@ app.post('/api/approve', async (req, res) => {
   }
 });
 
+// Batch limits: items accepted per request, and local JOLT provers run at once.
+// Each prover is a long-running native process, so neither is left unbounded.
+function positiveIntEnv(name, fallback) {
+  const n = Number.parseInt(process.env[name], 10);
+  return Number.isInteger(n) && n > 0 ? n : fallback;
+}
+const APPROVE_BATCH_MAX_ITEMS = positiveIntEnv('OOAK_BATCH_MAX_ITEMS', 16);
+const JOLT_BATCH_CONCURRENCY = positiveIntEnv('OOAK_BATCH_PROVERS', 2);
+
+// A batch item is a plain object whose amount/risk, when given, are finite numbers
+function isValidBatchItem(item) {
+  if (!item || typeof item !== 'object' || Array.isArray(item)) return false;
+  return ['amount', 'risk'].every((k) => item[k] === undefined || (typeof item[k] === 'number' && Number.isFinite(item[k])));
+}
+
+// Provers share one working directory; if a run can fall back to reading
+// <cwd>/llm_proof.json, parallel runs could hash each other's proof, so those
+// are proven one at a time.
+function joltBatchConcurrency() {
+  if (path.basename(JOLT_PROVER_BIN) !== 'proof_json_output') return 1;
+  if (fs.existsSync(path.resolve(JOLT_PROVER_BIN, '..', 'llm_proof.json'))) return 1;
+  return JOLT_BATCH_CONCURRENCY;
+}
+
+// Map over items with at most `limit` calls of fn in flight, preserving order
+async function mapWithConcurrency(items, limit, fn) {
+  const results = new Array(items.length);
+  let next = 0;
+  const worker = async () => {
+    while (next < items.length) {
+      const i = next++;
+      results[i] = await fn(items[i], i);
+    }
+  };
+  await Promise.all(Array.from({ length: Math.min(limit, items.length) }, worker));
+  return results;
+}
+
+// Batched approval: one ONNX run for all items, local zkML proofs generated
+// through a small bounded pool, then commitments anchored one at a time
+// (single signer nonce).
+app.post('/api/approve/batch', async (req, res) => {
+  try {
+    const { items } = req.body || {};
+    if (!Array.isArray(items) || !items.length) return res.status(400).json({ error: 'items_required' });
+    if (items.length > APPROVE_BATCH_MAX_ITEMS) {
+      return res.status(400).json({ error: 'too_many_items', max: APPROVE_BATCH_MAX_ITEMS });
+    }
+    const invalid = items.findIndex((item) => !isValidBatchItem(item));
+    if (invalid !== -1) return res.status(400).json({ error: 'invalid_item', index: invalid });
+    if (!COMMITMENT_REGISTRY_ADDRESS) {
+      return res.status(500).json({
+        error: 'commitment_registry_required',
+        message: 'COMMITMENT_REGISTRY_ADDRESS must be set for on-chain anchoring'
+      });
+    }
+
+    const inferences = await inferONNXBatch(items);
+    const proofs = await mapWithConcurrency(inferences, joltBatchConcurrency(), ({ decision, confidence }) =>
+      proveWithJolt(decision, confidence).catch((e) => ({ error: String(e) })));
+
+    const results = [];
+    for (let i = 0; i < items.length; i++) {
+      const { decision, confidence } = inferences[i];
+      const jolt = proofs[i];
+      if (!jolt || !jolt.proofHashHex) {
+        results.push({ decision, confidence, error: 'zkml_proof_required' });
+        continue;
+      }
+      const commit = await storeCommitment({
+        amount: items[i].amount ?? 25.0,
+        decision,
+        confidence,
+        proofHashHex: jolt.proofHashHex
+      }).catch((e) => ({ error: String(e) }));
+      results.push({
+        decision,
+        confidence,
+        jolt: { proofHashHex: jolt.proofHashHex, proofHashF: jolt.proofHashF },
+        onchain_verified: !!(commit && commit.stored),
+        commit: commit && commit.stored ? {
+          id: commit.commitId,
+          registry: commit.registry,
+          blockNumber: commit.blockNumber,
+          blockTimestamp: commit.blockTimestamp,
+          explorerLink: commit.explorer
+        } : null
+      });
+    }
+
+    res.json({ count: results.length, results });
+  } catch (e) {
+    res.status(500).json({ error: String(e) });
+  }
+});
+
 // Send USDC via SpendGate contract with zkML proof commitment
 app.post('/api/send-usdc', async (req, res) => {
   try {
@@ -378,21 +752,17 @@ app.post('/api/send-usdc', async (req, res) => {
       return res.status(400).json({ error: 'missing_env', message: 'Set SPEND_GATE_ADDRESS and COMMITMENT_REGISTRY_ADDRESS' });
     }
 
-    const rpc = process.env.ARC_RPC_URL || process.env.OOAK_RPC_URL || 'https://rpc.testnet.arc.network';
-    const provider = new ethers.JsonRpcProvider(rpc, { chainId: Number(process.env.ARC_CHAIN_ID || 5042002), name: 'arc-testnet' });
+    const provider = getProvider();
     const chainId = Number(process.env.ARC_CHAIN_ID || (await provider.getNetwork()).chainId);
     const pk = process.env.PRIVATE_KEY;
     if (!pk) return res.status(400).json({ error: 'PRIVATE_KEY_required' });
-    const wallet = new ethers.Wallet(pk, provider);
+    const wallet = getWallet(pk);
 
     // Run approval to obtain decision/confidence and JOLT proof hash
     const approval = await fetchJson('POST', '/api/approve', { amount: Number(amountStr), risk: 0.01 });
     if (!approval || approval.decision !== 1) return res.status(400).json({ error: 'approval_failed', details: approval });
 
-    const modelPath = process.env.OOAK_ONNX_MODEL || path.resolve(ROOT, '..', 'models', 'spending_model.onnx');
-    let modelBytes = new Uint8Array();
-    try { modelBytes = new Uint8Array(fs.readFileSync(modelPath)); } catch {}
-    const modelHash = ethers.keccak256(modelBytes);
+    const modelHash = getModelHash();
     const features = {
       amount_norm: Number(amountStr) / 1000.0, balance_norm: 1.0,
       vendor_trust: 0.8, velocity_1h_norm: 0.1, velocity_24h_norm: 0.2, kyc_ok: 1.0, aml_ok: 1.0
@@ -417,43 +787,12 @@ app.post('/api/send-usdc', async (req, res) => {
       attestor: wallet.address,
     };
     const domain = { name: 'CommitmentRegistry', version: '1', chainId, verifyingContract: COMMITMENT_REGISTRY_ADDRESS };
-    const types = { Commitment: [
-      { name: 'proofHash', type: 'bytes32' },
-      { name: 'modelHash', type: 'bytes32' },
-      { name: 'inputHash', type: 'bytes32' },
-      { name: 'decision', type: 'uint256' },
-      { name: 'confidence', type: 'uint256' },
-      { name: 'token', type: 'address' },
-      { name: 'to', type: 'address' },
-      { name: 'amount', type: 'uint256' },
-      { name: 'chainId', type: 'uint256' },
-      { name: 'nonce', type: 'uint256' },
-      { name: 'validUntil', type: 'uint256' },
-      { name: 'agent', type: 'address' },
-      { name: 'attestor', type: 'address' },
-    ] };
-    const signature = await wallet.signTypedData(domain, types, commitment);
-
-    const gateAbi = [ 'function spend((bytes32,bytes32,bytes32,uint256,uint256,address,address,uint256,uint256,uint256,uint256,address,address),bytes) payable' ];
-    const gate = new ethers.Contract(SPEND_GATE_ADDRESS, new ethers.Interface(gateAbi), wallet);
-    const commitmentArr = [
-      commitment.proofHash,
-      commitment.modelHash,
-      commitment.inputHash,
-      commitment.decision,
-      commitment.confidence,
-      commitment.token,
-      commitment.to,
-      commitment.amount,
-      commitment.chainId,
-      commitment.nonce,
-      commitment.validUntil,
-      commitment.agent,
-      commitment.attestor,
-    ];
+    const signature = await wallet.signTypedData(domain, REGISTRY_COMMITMENT_TYPES, commitment);
+
+    const gate = getContract(SPEND_GATE_ADDRESS, 'spendGate', wallet);
     // Track on-chain execution time only
     const txStartTime = Date.now();
-    const tx = await gate.spend(commitmentArr, signature, { value: amtWei });
+    const tx = await gate.spend(commitmentToTuple(commitment), signature, { value: amtWei });
     const receipt = await tx.wait();
     const onChainTime = ((Date.now() - txStartTime) / 1000).toFixed(3);
 
@@ -504,135 +843,97 @@ app.post('/api/send-usdc', async (req, res) => {
   }
 });
 
-// Store attested commitment on Arc (EIP-712) and return commitId + tx
-app.post('/api/commit/store', async (req, res) => {
-  try {
-    if (!COMMITMENT_REGISTRY_ADDRESS) return res.status(400).json({ error: 'missing_registry' });
-    const { amount = 25.0, decision = 1, confidence = 95, to, token, proofHashHex } = req.body || {};
-
-    const provider = new ethers.JsonRpcProvider(process.env.ARC_RPC_URL || process.env.OOAK_RPC_URL || 'https://rpc.testnet.arc.network');
-    const chainId = Number(process.env.ARC_CHAIN_ID || (await provider.getNetwork()).chainId);
-    const pk = process.env.ATTESTOR_PRIVATE_KEY || process.env.PRIVATE_KEY;
-    if (!pk) return res.status(400).json({ error: 'missing_private_key' });
-    const wallet = new ethers.Wallet(pk, provider);
-
-    // Compute modelHash and inputHash
-    const modelPath = process.env.OOAK_ONNX_MODEL || path.resolve(ROOT, '..', 'models', 'spending_model.onnx');
-    let modelBytes = new Uint8Array();
-    try { modelBytes = new Uint8Array(fs.readFileSync(modelPath)); } catch {}
-    const modelHash = ethers.keccak256(modelBytes);
-
-    const features = {
-      amount_norm: Number(amount) / 1000.0, balance_norm: 1.0,
-      vendor_trust: 0.8, velocity_1h_norm: 0.1, velocity_24h_norm: 0.2, kyc_ok: 1.0, aml_ok: 1.0
-    };
-    const inputHash = ethers.keccak256(ethers.toUtf8Bytes(JSON.stringify(features)));
-
-    const amtWei = ethers.parseUnits(String(amount), Number(process.env.ARC_NATIVE_DECIMALS || 18));
-    const commitment = {
-      proofHash: (proofHashHex && proofHashHex.startsWith('0x')) ? proofHashHex : (proofHashHex ? ('0x' + proofHashHex) : ethers.ZeroHash),
-      modelHash,
-      inputHash,
-      decision: Number(decision),
-      confidence: Number(confidence),
-      token: token || ethers.ZeroAddress,
-      to: to || wallet.address,
-      amount: amtWei,
-      chainId,
-      nonce: Date.now(),
-      validUntil: 0,
-      agent: wallet.address,
-      attestor: wallet.address,
-    };
-
-    const domain = { name: 'CommitmentRegistry', version: '1', chainId, verifyingContract: COMMITMENT_REGISTRY_ADDRESS };
-    const types = {
-      Commitment: [
-        { name: 'proofHash', type: 'bytes32' },
-        { name: 'modelHash', type: 'bytes32' },
-        { name: 'inputHash', type: 'bytes32' },
-        { name: 'decision', type: 'uint256' },
-        { name: 'confidence', type: 'uint256' },
-        { name: 'token', type: 'address' },
-        { name: 'to', type: 'address' },
-        { name: 'amount', type: 'uint256' },
-        { name: 'chainId', type: 'uint256' },
-        { name: 'nonce', type: 'uint256' },
-        { name: 'validUntil', type: 'uint256' },
-        { name: 'agent', type: 'address' },
-        { name: 'attestor', type: 'address' },
-      ]
-    };
-    const signature = await wallet.signTypedData(domain, types, commitment);
-
-    const abi = [
-      'function store((bytes32,bytes32,bytes32,uint256,uint256,address,address,uint256,uint256,uint256,uint256,address,address) c, bytes signature) returns (bytes32)'
-    ];
-    const reg = new ethers.Contract(COMMITMENT_REGISTRY_ADDRESS, new ethers.Interface(abi), wallet);
-
-    // Convert commitment object to array for contract call
-    const commitmentArray = [
-      commitment.proofHash,
-      commitment.modelHash,
-      commitment.inputHash,
-      commitment.decision,
-      commitment.confidence,
-      commitment.token,
-      commitment.to,
-      commitment.amount,
-      commitment.chainId,
-      commitment.nonce,
-      commitment.validUntil,
-      commitment.agent,
-      commitment.attestor
-    ];
-
-    const tx = await reg.store(commitmentArray, signature);
-    const rc = await tx.wait();
-    const commitId = rc.logs && rc.logs.length ? rc.logs[0].topics[1] : null; // first indexed arg (id)
-
-    // Extract block metadata
-    const blockNumber = rc.blockNumber;
-    let blockTimestamp = null;
-
-    // Try to get block timestamp, but skip if hitting rate limits
-    // Add retry logic for rate-limited RPC calls with longer delays
-    const retryWithBackoff = async (fn, maxRetries = 1) => { // Reduced to 1 retry
-      for (let i = 0; i < maxRetries; i++) {
-        try {
-          return await fn();
-        } catch (e) {
-          if (e.message?.includes('rate limit') || e.message?.includes('request limit') || e.code === -32007) {
-            console.log('[RPC] Rate limit hit, skipping blockTimestamp fetch');
-            return null;
-          } else {
-            throw e;
-          }
+// Store attested commitment on Arc (EIP-712) and return commitId + tx.
+// Approval flows call this directly rather than POSTing to /api/commit/store.
+async function storeCommitment({ amount = 25.0, decision = 1, confidence = 95, to, token, proofHashHex }) {
+  const provider = getProvider();
+  const chainId = Number(process.env.ARC_CHAIN_ID || (await provider.getNetwork()).chainId);
+  const wallet = getWallet(ATTESTOR_PRIVATE_KEY);
+
+  // Compute modelHash and inputHash
+  const modelHash = getModelHash();
+
+  const features = {
+    amount_norm: Number(amount) / 1000.0, balance_norm: 1.0,
+    vendor_trust: 0.8, velocity_1h_norm: 0.1, velocity_24h_norm: 0.2, kyc_ok: 1.0, aml_ok: 1.0
+  };
+  const inputHash = ethers.keccak256(ethers.toUtf8Bytes(JSON.stringify(features)));
+
+  const amtWei = ethers.parseUnits(String(amount), Number(process.env.ARC_NATIVE_DECIMALS || 18));
+  const commitment = {
+    proofHash: (proofHashHex && proofHashHex.startsWith('0x')) ? proofHashHex : (proofHashHex ? ('0x' + proofHashHex) : ethers.ZeroHash),
+    modelHash,
+    inputHash,
+    decision: Number(decision),
+    confidence: Number(confidence),
+    token: token || ethers.ZeroAddress,
+    to: to || wallet.address,
+    amount: amtWei,
+    chainId,
+    nonce: Date.now(),
+    validUntil: 0,
+    agent: wallet.address,
+    attestor: wallet.address,
+  };
+
+  const domain = { name: 'CommitmentRegistry', version: '1', chainId, verifyingContract: COMMITMENT_REGISTRY_ADDRESS };
+  const signature = await wallet.signTypedData(domain, REGISTRY_COMMITMENT_TYPES, commitment);
+
+  const reg = getContract(COMMITMENT_REGISTRY_ADDRESS, 'registry', wallet);
+
+  const tx = await reg.store(commitmentToTuple(commitment), signature);
+  const rc = await tx.wait();
+  const commitId = rc.logs && rc.logs.length ? rc.logs[0].topics[1] : null; // first indexed arg (id)
+
+  // Extract block metadata
+  const blockNumber = rc.blockNumber;
+  let blockTimestamp = null;
+
+  // Try to get block timestamp, but skip if hitting rate limits
+  // Add retry logic for rate-limited RPC calls with longer delays
+  const retryWithBackoff = async (fn, maxRetries = 1) => { // Reduced to 1 retry
+    for (let i = 0; i < maxRetries; i++) {
+      try {
+        return await fn();
+      } catch (e) {
+        if (e.message?.includes('rate limit') || e.message?.includes('request limit') || e.code === -32007) {
+          console.log('[RPC] Rate limit hit, skipping blockTimestamp fetch');
+          return null;
+        } else {
+          throw e;
         }
       }
-      return null;
-    };
-
-    try {
-      // Add delay before fetching block to avoid hitting rate limits
-      await new Promise(r => setTimeout(r, 1000));
-      blockTimestamp = await retryWithBackoff(async () => {
-        const block = await provider.getBlock(rc.blockNumber);
-        return block.timestamp;
-      });
-    } catch (e) {
-      console.log('[commit/store] Skipping blockTimestamp:', e.message?.substring(0, 100));
     }
+    return null;
+  };
 
-    res.json({
-      stored: true,
-      txHash: rc.hash,
-      commitId,
-      blockNumber,
-      blockTimestamp,
-      registry: COMMITMENT_REGISTRY_ADDRESS,
-      explorer: `https://testnet.arcscan.app/tx/${rc.hash}`
+  try {
+    // Add delay before fetching block to avoid hitting rate limits
+    await new Promise(r => setTimeout(r, 1000));
+    blockTimestamp = await retryWithBackoff(async () => {
+      const block = await provider.getBlock(rc.blockNumber);
+      return block.timestamp;
     });
+  } catch (e) {
+    console.log('[commit/store] Skipping blockTimestamp:', e.message?.substring(0, 100));
+  }
+
+  return {
+    stored: true,
+    txHash: rc.hash,
+    commitId,
+    blockNumber,
+    blockTimestamp,
+    registry: COMMITMENT_REGISTRY_ADDRESS,
+    explorer: `https://testnet.arcscan.app/tx/${rc.hash}`
+  };
+}
+
+app.post('/api/commit/store', async (req, res) => {
+  try {
+    if (!COMMITMENT_REGISTRY_ADDRESS) return res.status(400).json({ error: 'missing_registry' });
+    if (!ATTESTOR_PRIVATE_KEY) return res.status(400).json({ error: 'missing_private_key' });
+    res.json(await storeCommitment(req.body || {}));
   } catch (e) {
     res.status(500).json({ error: String(e) });
   }
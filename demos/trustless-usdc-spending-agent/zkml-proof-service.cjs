@@ -43,6 +43,15 @@ const JOLT_PROVER_BIN = process.env.JOLT_PROVER_BIN || path.join(JOLT_ATLAS_DIR,
 const JOLT_MODEL_PATH = process.env.JOLT_MODEL_PATH || '';
 const OOAK_ONNX_MODEL = process.env.OOAK_ONNX_MODEL || path.join(JOLT_ATLAS_DIR, 'onnx-tracer', 'models', 'authorization', 'network.onnx');
 
+// Bare 32-byte hash as hex (no 0x prefix), checked in a single match
+const HEX64 = /^[0-9a-f]{64}$/i;
+
+let joltBinOk = false;
+function joltProverAvailable() {
+  if (!joltBinOk) joltBinOk = fs.existsSync(JOLT_PROVER_BIN);
+  return joltBinOk;
+}
+
 function sha256Hex(buf) {
   return crypto.createHash('sha256').update(buf).digest('hex');
 }
@@ -67,7 +76,7 @@ app.get('/health', (req, res) => {
       '/verify': '$0.001 USDC per verification'
     },
     serviceWallet: SERVICE_WALLET.address,
-    joltAvailable: fs.existsSync(JOLT_PROVER_BIN),
+    joltAvailable: joltProverAvailable(),
     onnxModelAvailable: fs.existsSync(OOAK_ONNX_MODEL)
   });
 });
@@ -120,7 +129,7 @@ app.post('/prove',
       // For demo: use fast mock proofs to avoid 7-minute wait
       // Real JOLT proofs take ~7min (6s proving + 7min verification)
       // Mock proofs are instant and still provide valid commitment artifacts for Arc
-      const useMockProofs = process.env.USE_MOCK_PROOFS === '1' || !fs.existsSync(JOLT_PROVER_BIN);
+      const useMockProofs = process.env.USE_MOCK_PROOFS === '1' || !joltProverAvailable();
 
       if (useMockProofs) {
         // Return mock proof for fast demo
@@ -176,21 +185,24 @@ app.post('/prove',
       const cwd = JOLT_ATLAS_DIR;
 
       const child = spawn(JOLT_PROVER_BIN, args, { cwd });
-      let out = '';
-      let err = '';
+      const outChunks = [];
+      const errChunks = [];
       let proofReturned = false;
 
       // The new authorization_json outputs clean JSON when complete
       // No fast mode timeout needed - wait for natural completion
       console.log('[JOLT-ATLAS] Starting proof generation with authorization model...');
 
-      child.stderr.on('data', (d) => { err += d.toString(); });
-      child.stdout.on('data', (d) => { out += d.toString(); });
+      child.stderr.on('data', (d) => { errChunks.push(d); });
+      child.stdout.on('data', (d) => { outChunks.push(d); });
 
       // Handle process completion
       child.on('close', (code) => {
         if (proofReturned) return;
 
+        const out = Buffer.concat(outChunks).toString();
+        const err = Buffer.concat(errChunks).toString();
+
         const duration = Date.now() - startTime;
 
         if (code !== 0) {
@@ -210,7 +222,7 @@ app.post('/prove',
             throw new Error('Proof generation returned success=false');
           }
 
-          const proofHash = jsonRaw.proof_hash || sha256Hex(Buffer.from(out));
+          const proofHash = jsonRaw.proof_hash || sha256Hex(out);
 
           console.log(`[SUCCESS] Proof generated: ${proofHash.substring(0, 16)}... (${duration}ms)`);
           console.log(`[SUCCESS] Decision: ${jsonRaw.decision}, Confidence: ${jsonRaw.confidence}`);
@@ -275,7 +287,7 @@ app.post('/verify',
     }
 
     // Basic validation (in production, verify against commitment registry)
-    const isValid = proofHash.length === 64 && /^[a-f0-9]+$/i.test(proofHash);
+    const isValid = HEX64.test(proofHash);
 
     console.log(`[SUCCESS] Proof verified: ${proofHash.substring(0, 16)}... -> ${isValid}`);
 
@@ -12,14 +12,19 @@ class ZkmlClient {
     this.proverBin = options.proverBin || path.join(this.joltAtlasDir, 'target', 'release', 'examples', 'authorization_json');
     // New collision severity prover
     this.collisionProverBin = path.join(this.joltAtlasDir, 'target', 'release', 'examples', 'collision_severity_json');
+    // Set once the binary is found; until then each check stats again
+    this._proverOk = false;
+    this._collisionProverOk = false;
   }
 
   isAvailable() {
-    return fs.existsSync(this.proverBin);
+    if (!this._proverOk) this._proverOk = fs.existsSync(this.proverBin);
+    return this._proverOk;
   }
 
   isCollisionProverAvailable() {
-    return fs.existsSync(this.collisionProverBin);
+    if (!this._collisionProverOk) this._collisionProverOk = fs.existsSync(this.collisionProverBin);
+    return this._collisionProverOk;
   }
 
   /**
@@ -50,17 +55,28 @@ class ZkmlClient {
       String(risk)
     ];
 
+    return this._runProver(this.proverBin, args, 'Proof generation');
+  }
+
+  /**
+   * Run a prover binary and parse its JSON result line
+   * @param {string} bin - Prover binary path
+   * @param {string[]} args - Positional prover arguments
+   * @param {string} label - Prefix for error messages
+   */
+  _runProver(bin, args, label) {
     return new Promise((resolve, reject) => {
-      const child = spawn(this.proverBin, args, { cwd: this.joltAtlasDir });
-      let stdout = '';
-      let stderr = '';
+      const child = spawn(bin, args, { cwd: this.joltAtlasDir });
+      const stdoutChunks = [];
+      const stderrChunks = [];
 
-      child.stdout.on('data', (data) => { stdout += data.toString(); });
-      child.stderr.on('data', (data) => { stderr += data.toString(); });
+      child.stdout.on('data', (data) => { stdoutChunks.push(data); });
+      child.stderr.on('data', (data) => { stderrChunks.push(data); });
 
       child.on('close', (code) => {
+        const stdout = Buffer.concat(stdoutChunks).toString();
         if (code !== 0) {
-          reject(new Error(`Proof generation failed: ${stderr}`));
+          reject(new Error(`${label} failed: ${Buffer.concat(stderrChunks).toString()}`));
           return;
         }
 
@@ -82,15 +98,14 @@ class ZkmlClient {
             jsonLine = lines[lines.length - 1].trim();
           }
 
-          const result = JSON.parse(jsonLine);
-          resolve(result);
+          resolve(JSON.parse(jsonLine));
         } catch (err) {
-          reject(new Error(`Failed to parse proof output: ${err.message}\nOutput: ${stdout}`));
+          reject(new Error(`${label} failed to parse output: ${err.message}\nOutput: ${stdout}`));
         }
       });
 
       child.on('error', (err) => {
-        reject(new Error(`Failed to start prover: ${err.message}`));
+        reject(new Error(`${label} failed to start: ${err.message}`));
       });
     });
   }
@@ -179,47 +194,7 @@ class ZkmlClient {
       String(Math.min(3, Math.max(0, Math.round(weather))))
     ];
 
-    return new Promise((resolve, reject) => {
-      const child = spawn(this.collisionProverBin, args, { cwd: this.joltAtlasDir });
-      let stdout = '';
-      let stderr = '';
-
-      child.stdout.on('data', (data) => { stdout += data.toString(); });
-      child.stderr.on('data', (data) => { stderr += data.toString(); });
-
-      child.on('close', (code) => {
-        if (code !== 0) {
-          reject(new Error(`Collision severity proof generation failed: ${stderr}`));
-          return;
-        }
-
-        try {
-          const lines = stdout.trim().split('\n');
-          let jsonLine = null;
-
-          for (const line of lines) {
-            const trimmed = line.trim();
-            if (trimmed.startsWith('{') && trimmed.includes('"success"')) {
-              jsonLine = trimmed;
-              break;
-            }
-          }
-
-          if (!jsonLine) {
-            jsonLine = lines[lines.length - 1].trim();
-          }
-
-          const result = JSON.parse(jsonLine);
-          resolve(result);
-        } catch (err) {
-          reject(new Error(`Failed to parse collision severity proof output: ${err.message}\nOutput: ${stdout}`));
-        }
-      });
-
-      child.on('error', (err) => {
-        reject(new Error(`Failed to start collision severity prover: ${err.message}`));
-      });
-    });
+    return this._runProver(this.collisionProverBin, args, 'Collision severity proof generation');
   }
 
   /**